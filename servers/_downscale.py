@@ -0,0 +1,42 @@
+"""
+Integer-factor box downscale for BGRX frames (scale = 1/2, 1/4, 1/8).
+
+Averages each k x k block per channel. Uses a numba kernel when numba is
+installed, otherwise a reshape + sum in numpy; both stay off the Python
+interpreter's per-pixel path.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None  # type: ignore
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _box_kernel(src, k):
+        oh = src.shape[0] // k
+        ow = src.shape[1] // k
+        n = k * k
+        out = np.empty((oh, ow, 4), dtype=np.uint8)
+        for y in prange(oh):
+            for x in range(ow):
+                for c in range(4):
+                    acc = 0
+                    for dy in range(k):
+                        for dx in range(k):
+                            acc += src[y * k + dy, x * k + dx, c]
+                    out[y, x, c] = (acc + n // 2) // n
+        return out
+
+
+def box_downscale(src: np.ndarray, k: int) -> np.ndarray:
+    """Downscale an (h, w, 4) uint8 array by an integer factor k; trailing rows/cols are dropped."""
+    h = src.shape[0] // k * k
+    w = src.shape[1] // k * k
+    if njit is not None:
+        return _box_kernel(src[:h, :w], k)
+    blocks = src[:h, :w].reshape(h // k, k, w // k, k, 4)
+    return ((blocks.sum(axis=(1, 3), dtype=np.uint16) + (k * k) // 2) // (k * k)).astype(np.uint8)
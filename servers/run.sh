@@ -15,8 +15,16 @@ fi
 
 # 2) Ensure deps (idempotent). All output -> STDERR.
 if [ -f "$SERVERS_DIR/requirements.txt" ]; then
-  "$VENV/bin/pip" install -r "$SERVERS_DIR/requirements.txt" \
+  REQS="$SERVERS_DIR/requirements.txt"
+  # Pillow-SIMD is a separate distribution that satisfies no "pillow" requirement;
+  # drop that line so pip doesn't reinstall stock Pillow over it on every launch
+  if "$VENV/bin/pip" show pillow-simd --disable-pip-version-check >/dev/null 2>&1; then
+    REQS="$(mktemp)"
+    grep -viE '^pillow([<>=!~;[:space:]].*)?$' "$SERVERS_DIR/requirements.txt" > "$REQS"
+  fi
+  "$VENV/bin/pip" install -r "$REQS" \
     --disable-pip-version-check --no-input -q 1>&2
+  if [ "$REQS" != "$SERVERS_DIR/requirements.txt" ]; then rm -f "$REQS"; fi
 fi
 
 # 3) Exec the MCP server (this must be the ONLY thing that writes to STDOUT)
@@ -5,23 +5,37 @@ Tools:
   - list_displays(max_index?: int=10)
   - screenshare_start(monitor_index?: int=1, left?: int=0, top?: int=0, width?: int=0, height?: int=0, scale?: float=1.0)
   - screenshare_status()
-  - screenshare_capture(save_dir?: str="~/.screen_frames", format?: "jpg"|"png"="jpg")
-  - screenshare_burst(n?: int=8, period_ms?: int=150, save_dir?: str=".", format?: "jpg"|"png"="jpg", warmup?: int=0, duration_ms?: int=0)
+  - screenshare_capture(save_dir?: str="~/.screen_frames", format?: "jpg"|"png"|"webp"="jpg")
+  - screenshare_burst(n?: int=8, period_ms?: int=150, save_dir?: str=".", format?: "jpg"|"png"|"webp"="jpg", warmup?: int=0, duration_ms?: int=0, output?: "file"|"shm"="file")
+  - screenshare_capture_shm()
   - screenshare_stop()
 
 Notes:
 - Drop-in replacement for the webcam-based screenshare MCP, but sources are screen grabs.
-- Uses mss (fast, cross-platform) + PIL for encoding.
+- Uses mss (fast, cross-platform) + PIL for encoding; JPEG goes through TurboJPEG when available.
 - No base64 in responses (optimized for @file attachment flow).
+- Raw mode: screenshare_capture_shm / screenshare_burst(output="shm") skip encoding and disk entirely
+  and hand back slots of a shared-memory ring of BGRX frames (multiprocessing.shared_memory).
 - Pure MCP over stdio (FastMCP). Logs to stderr only. No network calls.
 
 Install deps:
   pip install mss pillow fastmcp  # or mcp.server.fastmcp
+  pip install numpy PyTurboJPEG   # optional: libjpeg-turbo JPEG encode (needs libturbojpeg)
+  pip uninstall -y pillow && pip install pillow-simd   # optional: SSE4/AVX2 resize (run.sh keeps it)
+  pip install nvidia-nvimgcodec-cu12  # optional: nvJPEG encode for frames > 2 MP on CUDA machines
+  pip install xxhash              # optional: faster frame hashing for burst de-duplication
+  pip install numba               # optional: parallel kernel for 1/2, 1/4, 1/8 box downscale
+  pip install xcffib              # optional: X11 MIT-SHM capture
+  pip install pywayland           # optional: wlroots screencopy (see _WlrScreencopy)
 """
 
-import os, sys, time, logging
+import os, sys, time, logging, threading, queue, shutil, struct, subprocess, tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from io import BytesIO
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, BinaryIO
 
 # ----- Logging to stderr only -----
 logging.basicConfig(
@@ -45,29 +59,506 @@ except Exception as e:
     log.error("Missing dependency: %s (pip install mss pillow)", e)
     raise
 
+try:
+    import numpy as np
+except Exception:
+    np = None  # type: ignore
+
+# Downscale filter for scale < 1.0 (NEAREST|BILINEAR|BICUBIC|LANCZOS). BICUBIC on
+# Pillow-SIMD is visually on par with LANCZOS for UI screenshots at ~3x the throughput.
+_RESAMPLE = getattr(Image, os.getenv("SCREENSHARE_RESAMPLE", "BICUBIC").upper(), Image.BICUBIC)
+
+# Power-of-two scales take the box-average path in _downscale.py instead of a PIL resize
+_BOX_FACTORS = {0.5: 2, 0.25: 4, 0.125: 8}
+try:
+    if np is None:
+        raise ImportError("numpy is required for box downscale")
+    from _downscale import box_downscale
+except Exception:
+    box_downscale = None  # type: ignore
+
+# JPEG knobs: quality 1..95 and chroma subsampling 444|422|420. 4:2:0 at q=85 is visually
+# lossless for UI screenshots and ~35% smaller than 4:4:4 at q=92.
+_JPEG_Q = int(os.getenv("SCREENSHARE_JPEG_Q", "85"))
+_JPEG_SUB = os.getenv("SCREENSHARE_JPEG_SUB", "420")
+if _JPEG_SUB not in ("444", "422", "420"):
+    _JPEG_SUB = "420"
+_PIL_SUBSAMPLING = {"444": 0, "422": 1, "420": 2}
+
+# Frame fingerprint for burst de-duplication: xxh3 when available, zlib's CRC32 otherwise
+try:
+    import xxhash
+
+    def _hash64(buf) -> int:
+        return xxhash.xxh3_64_intdigest(buf)
+except Exception:
+    import zlib
+
+    def _hash64(buf) -> int:
+        return zlib.crc32(buf)
+
+# ---------- Optional: libjpeg-turbo direct JPEG encode ----------
+try:
+    if np is None:
+        raise ImportError("numpy is required for TurboJPEG")
+    from turbojpeg import TurboJPEG, TJPF_BGRX, TJPF_RGB, TJSAMP_444, TJSAMP_422, TJSAMP_420
+    _TJ = TurboJPEG()
+    _TJ_SUBSAMPLE = {"444": TJSAMP_444, "422": TJSAMP_422, "420": TJSAMP_420}[_JPEG_SUB]
+except Exception as e:  # missing wheel or libturbojpeg shared library
+    log.info("TurboJPEG unavailable, using PIL for JPEG: %s", e)
+    _TJ = None
+
+# ---------- Optional: GPU JPEG encode (nvImageCodec / nvJPEG) ----------
+# Only pays off for large frames; below ~2 MP the host<->device copies eat the gain.
+_GPU_JPEG_MIN_PIXELS = 2_000_000
+try:
+    if os.getenv("SCREENSHARE_GPU_JPEG", "1") == "0":
+        raise ImportError("disabled by SCREENSHARE_GPU_JPEG=0")
+    from nvidia import nvimgcodec
+except Exception:
+    nvimgcodec = None  # type: ignore
+
+# ---------- Optional: X11 MIT-SHM capture (xcffib) ----------
+try:
+    import ctypes, ctypes.util
+    import xcffib, xcffib.xproto, xcffib.shm
+except Exception:
+    xcffib = None  # type: ignore
+
+_IPC_PRIVATE, _IPC_CREAT, _IPC_RMID = 0, 0o1000, 0
+
+# ---------- Optional: wlroots screencopy (pywayland) ----------
+# wlr_screencopy_unstable_v1 is not bundled with pywayland; generate it with
+#   python -m pywayland.scanner -i /usr/share/wlr-protocols/unstable/wlr-screencopy-unstable-v1.xml
+try:
+    import mmap
+    from pywayland.client import Display as WlDisplay
+    from pywayland.protocol.wayland import WlOutput, WlShm
+    from pywayland.protocol.wlr_screencopy_unstable_v1 import ZwlrScreencopyManagerV1
+except Exception:
+    ZwlrScreencopyManagerV1 = None  # type: ignore
+
+# Windows-side capture helper used under WSL (build: servers/wsl_helper/screenshare_helper.c)
+_WSL_HELPER = os.getenv(
+    "SCREENSHARE_WSL_HELPER",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin", "screenshare_helper.exe"),
+)
+
+_WL_SHM_ARGB8888, _WL_SHM_XRGB8888 = 0, 1   # little-endian BGRA/BGRX in memory
+_WLR_FRAME_Y_INVERT = 1
+
 # Global capture configuration
 _SRC = {
-    "sct": None,          # mss.mss() handle
+    "open": False,        # source initialized (mss handles live per-thread, see _sct())
     "monitor_index": 1,   # mss uses 1..N for real monitors, 0 is virtual full area
     "region": None,       # dict(left, top, width, height) or None for full monitor
     "scale": 1.0,         # optional downscale (0.1..1.0)
     "props": {},
+    "xshm": None,         # _XShmGrabber, False if unavailable, None if not probed yet
+    "wlr": None,          # _WlrScreencopy, same convention as "xshm"
+    "wsl_helper": None,   # _WslHelper, same convention as "xshm"
+    "pool": None,         # ThreadPoolExecutor for burst encode+write
+    "last_frame": None,   # ((hash, fmt), path, future) of the last encoded burst frame
+    "ring": [],           # pinned BGRX capture buffers, see _pinned()
+    "grab_fn": None,      # backend closure bound by _select_grabber()
+    "grab_name": None,
+    "grab_key": None,     # _SRC key of the bound stateful grabber ("xshm" / "wlr" / "wsl_helper")
+    "ring_i": 0,
+    "ring_owner": [],     # per ring slot: future of the encode still reading it, else None
+    "ring_seq": 0,        # buffers handed out by _pinned() so far
+    "shm": None,          # raw-frame ring: {"mem": SharedMemory, "slot_size": int, "seq": int}
+    "nvjpeg": None,       # (Encoder, EncodeParams, Lock) for GPU JPEG, same convention as "xshm"
 }
+_SRC_LOCK = threading.RLock()   # held through each start/capture/burst/stop call, so stop never tears down a running grab
+
+# list_displays results are reused for a short while (clients poll it at startup);
+# each refresh costs EnumDisplayMonitors on Windows / an Xrandr round-trip on X11
+_MON_CACHE: Dict[str, Any] = {"t": 0.0, "mons": None}
+_MON_CACHE_TTL = 1.0
+
+# Burst pipeline: the caller thread grabs, workers encode + write (PIL/TurboJPEG release the GIL)
+_BURST_WORKERS = max(1, int(os.getenv("SCREENSHARE_BURST_WORKERS", "2")))
+# SCREENSHARE_ODIRECT=1: write burst frames synchronously (O_DSYNC, one writev) and evict them
+# from the page cache, so frames that are never re-read don't push out useful cached data.
+# (True O_DIRECT would need block-aligned lengths, which encoded images don't have.)
+_ODIRECT = os.getenv("SCREENSHARE_ODIRECT") == "1"
+
+# WebP knobs: quality 0..100 and method 0 (fastest) .. 6 (smallest)
+_WEBP_Q = int(os.getenv("SCREENSHARE_WEBP_Q", "80"))
+_WEBP_METHOD = int(os.getenv("SCREENSHARE_WEBP_METHOD", "4"))
+
+# format -> (file extension, MIME type); anything unrecognised is written as PNG
+_FORMATS = {
+    "jpg": (".jpg", "image/jpeg"),
+    "png": (".png", "image/png"),
+    "webp": (".webp", "image/webp"),
+}
+
+# Raw-frame output: ring of SCREENSHARE_SHM_SLOTS BGRX frames in one shared-memory block
+_SHM_SLOTS = max(1, int(os.getenv("SCREENSHARE_SHM_SLOTS", "8")))
+
+# Enough pinned buffers for every worker's frame plus the one being grabbed; _pinned() waits
+# for a slot's pending encode before reusing it, and burst caps queued encodes at _BURST_WORKERS.
+_RING_SLOTS = _BURST_WORKERS + 2
+
+# mss keeps per-thread capture state (XImage / BITMAPINFO buffers), so each thread keeps
+# one persistent handle instead of creating a fresh mss.mss() per call.
+_TL = threading.local()
+_TL_LOCK = threading.Lock()
+_TL_HANDLES: list = []   # every handle handed out, so _close_source can release them
+_TL_GEN = [0]            # bumped on release; stale per-thread handles are recreated
+
+
+def _sct():
+    """Return the calling thread's persistent mss handle, creating it on first use."""
+    sct = getattr(_TL, "sct", None)
+    if sct is None or getattr(_TL, "gen", None) != _TL_GEN[0]:
+        sct = mss.mss()
+        with _TL_LOCK:
+            _TL_HANDLES.append(sct)
+            _TL.gen = _TL_GEN[0]
+        _TL.sct = sct
+    return sct
+
+
+def _rescan_monitors(sct) -> list:
+    """Re-enumerate monitors on a persistent handle (mss memoizes them) and refresh _MON_CACHE."""
+    if isinstance(getattr(sct, "_monitors", None), list):
+        sct._monitors.clear()
+    mons = sct.monitors  # 0=virtual bounding box, 1..N real
+    _MON_CACHE.update({"t": time.monotonic(), "mons": mons})
+    return mons
+
+
+def _release_handles():
+    with _TL_LOCK:
+        handles = list(_TL_HANDLES)
+        _TL_HANDLES.clear()
+        _TL_GEN[0] += 1
+    for sct in handles:
+        try:
+            sct.close()
+        except Exception:
+            pass
+
+
+def _pinned(shape: Tuple[int, int, int]):
+    """Next buffer of the pinned capture ring; slots are allocated once per frame size and reused."""
+    ring = _SRC["ring"]
+    if not ring or (ring[0] is not None and ring[0].shape != shape):
+        # old buffers stay alive through the frames still referencing them
+        ring = _SRC["ring"] = [None] * _RING_SLOTS
+        _SRC["ring_owner"] = [None] * _RING_SLOTS
+        _SRC["ring_i"] = 0
+    i = _SRC["ring_i"]
+    _SRC["ring_i"] = (i + 1) % len(ring)
+    _SRC["ring_seq"] += 1
+    owner = _SRC["ring_owner"][i]
+    if owner is not None:
+        # a queued encode still reads this slot: wait for it before overwriting
+        _SRC["ring_owner"][i] = None
+        owner.result()
+    if ring[i] is None:
+        ring[i] = np.empty(shape, dtype=np.uint8)
+    return ring[i]
+
+
+def _claim_slot(seq_before: int, fut):
+    """Mark the slot handed out since seq_before as in use until fut completes."""
+    if _SRC["ring_seq"] != seq_before and _SRC["ring_owner"]:
+        _SRC["ring_owner"][(_SRC["ring_i"] - 1) % len(_SRC["ring_owner"])] = fut
+
+
+class _XShmGrabber:
+    """XShmGetImage into a cached SysV shared-memory segment (no per-frame X socket copy)."""
+
+    def __init__(self):
+        self.conn = xcffib.connect()
+        self.shm = self.conn(xcffib.shm.key)
+        self.shm.QueryVersion().reply()  # raises if MIT-SHM is not available
+        self.root = self.conn.get_setup().roots[self.conn.pref_screen].root
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+        self.libc = libc
+        self.seg = self.addr = self.view = None
+        self.size = (0, 0)
+
+    def _attach(self, w: int, h: int):
+        self._detach()
+        nbytes = w * h * 4
+        shmid = self.libc.shmget(_IPC_PRIVATE, nbytes, _IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget failed")
+        addr = self.libc.shmat(shmid, None, 0)
+        if addr is None or addr == ctypes.c_void_p(-1).value:
+            self.libc.shmctl(shmid, _IPC_RMID, None)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+        seg = self.conn.generate_id()
+        try:
+            self.shm.AttachChecked(seg, shmid, False).check()
+        finally:
+            # segment lives until both sides detach; nothing leaks if we crash
+            self.libc.shmctl(shmid, _IPC_RMID, None)
+        self.seg, self.addr, self.size = seg, addr, (w, h)
+        self.view = np.ctypeslib.as_array((ctypes.c_ubyte * nbytes).from_address(addr)).reshape(h, w, 4)
+
+    def _detach(self):
+        if self.seg is not None:
+            try:
+                self.shm.Detach(self.seg)
+                self.conn.flush()
+            except Exception:
+                pass
+            self.libc.shmdt(self.addr)
+        self.seg = self.addr = self.view = None
+        self.size = (0, 0)
+
+    def grab(self, region: Dict[str, int]):
+        w, h = int(region["width"]), int(region["height"])
+        if self.size != (w, h):
+            self._attach(w, h)
+        rep = self.shm.GetImage(
+            self.root, int(region["left"]), int(region["top"]), w, h,
+            0xFFFFFFFF, xcffib.xproto.ImageFormat.ZPixmap, self.seg, 0,
+        ).reply()
+        if rep.depth not in (24, 32):
+            raise RuntimeError(f"unsupported X depth {rep.depth}")
+        # copy out of the shared segment (the next grab overwrites it) into a pinned buffer
+        out = _pinned(self.view.shape)
+        np.copyto(out, self.view)
+        return out
+
+    def close(self):
+        self._detach()
+        try:
+            self.conn.disconnect()
+        except Exception:
+            pass
+
+
+def _xshm() -> Optional[_XShmGrabber]:
+    """Return the cached MIT-SHM grabber, or None if X11/MIT-SHM is unavailable."""
+    xs = _SRC.get("xshm")
+    if xs is None:
+        xs = False
+        if xcffib is not None and np is not None and os.environ.get("DISPLAY"):
+            try:
+                xs = _XShmGrabber()
+            except Exception as e:
+                log.info("MIT-SHM capture unavailable: %s", e)
+        _SRC["xshm"] = xs
+    return xs or None
+
+
+class _WlrScreencopy:
+    """zwlr_screencopy_manager_v1 capture into a reusable memfd-backed wl_shm buffer."""
+
+    def __init__(self, monitor_index: int):
+        self.shm = self.manager = None
+        self.version = 1
+        self.outputs: list = []
+        self.display = WlDisplay()
+        self.display.connect()
+        registry = self.display.get_registry()
+        registry.dispatcher["global"] = self._on_global
+        self.display.roundtrip()
+        if self.manager is None or self.shm is None or not self.outputs:
+            self.display.disconnect()
+            raise RuntimeError("compositor does not advertise zwlr_screencopy_manager_v1")
+        # monitor_index 0 (virtual) and 1 both map to the first output
+        self.output = self.outputs[min(max(0, monitor_index - 1), len(self.outputs) - 1)]
+        self.fd = self.mm = self.pool = self.buffer = None
+        self.layout = None  # (format, width, height, stride) of the cached buffer
+
+    def _on_global(self, registry, name, interface, version):
+        if interface == "wl_shm":
+            self.shm = registry.bind(name, WlShm, 1)
+        elif interface == "wl_output":
+            self.outputs.append(registry.bind(name, WlOutput, 1))
+        elif interface == "zwlr_screencopy_manager_v1":
+            self.version = min(version, 3)
+            self.manager = registry.bind(name, ZwlrScreencopyManagerV1, self.version)
+
+    def _ensure_buffer(self, fmt: int, w: int, h: int, stride: int):
+        if self.layout == (fmt, w, h, stride):
+            return
+        self._free_buffer()
+        size = stride * h
+        self.fd = os.memfd_create("screenshare", os.MFD_CLOEXEC)
+        os.ftruncate(self.fd, size)
+        self.mm = mmap.mmap(self.fd, size)
+        self.pool = self.shm.create_pool(self.fd, size)
+        self.buffer = self.pool.create_buffer(0, w, h, stride, fmt)
+        self.layout = (fmt, w, h, stride)
+
+    def _free_buffer(self):
+        if self.buffer is not None:
+            self.buffer.destroy()
+            self.pool.destroy()
+            self.mm.close()
+            os.close(self.fd)
+        self.fd = self.mm = self.pool = self.buffer = None
+        self.layout = None
+
+    def grab(self):
+        state: Dict[str, Any] = {"flags": 0}
+
+        def on_buffer(frame, fmt, w, h, stride):
+            if fmt not in (_WL_SHM_ARGB8888, _WL_SHM_XRGB8888):
+                state["failed"] = f"unsupported wl_shm format {fmt}"
+                return
+            self._ensure_buffer(fmt, w, h, stride)
+            if self.version < 3:  # v3 announces all buffer types first, then buffer_done
+                frame.copy(self.buffer)
+
+        def on_buffer_done(frame):
+            if "failed" not in state:
+                frame.copy(self.buffer)
+
+        frame = self.manager.capture_output(0, self.output)
+        frame.dispatcher["buffer"] = on_buffer
+        frame.dispatcher["buffer_done"] = on_buffer_done
+        frame.dispatcher["linux_dmabuf"] = lambda f, *a: None
+        frame.dispatcher["damage"] = lambda f, *a: None
+        frame.dispatcher["flags"] = lambda f, flags: state.update(flags=flags)
+        frame.dispatcher["ready"] = lambda f, *a: state.update(ready=True)
+        frame.dispatcher["failed"] = lambda f: state.update(failed="compositor reported failure")
+        try:
+            while "ready" not in state and "failed" not in state:
+                self.display.dispatch(block=True)
+        finally:
+            frame.destroy()
+        if "failed" in state:
+            raise RuntimeError(state["failed"])
+
+        _, w, h, stride = self.layout
+        arr = np.frombuffer(self.mm, dtype=np.uint8, count=stride * h).reshape(h, stride // 4, 4)[:, :w]
+        if state["flags"] & _WLR_FRAME_Y_INVERT:
+            arr = arr[::-1]
+        # copy out of the shm pool (the next capture overwrites it) into a pinned buffer
+        out = _pinned((h, w, 4))
+        np.copyto(out, arr)
+        return out
+
+    def close(self):
+        self._free_buffer()
+        try:
+            self.display.disconnect()
+        except Exception:
+            pass
+
+
+def _wlr() -> Optional[_WlrScreencopy]:
+    """Return the cached wlroots screencopy client, or None if the protocol is unavailable."""
+    wc = _SRC.get("wlr")
+    if wc is None:
+        wc = False
+        if ZwlrScreencopyManagerV1 is not None and np is not None and os.environ.get("WAYLAND_DISPLAY"):
+            try:
+                wc = _WlrScreencopy(int(_SRC.get("monitor_index") or 1))
+            except Exception as e:
+                log.info("wlr-screencopy unavailable: %s", e)
+        _SRC["wlr"] = wc
+    return wc or None
+
+
+class _WslHelper:
+    """Persistent screenshare_helper.exe process streaming BGRX frames of the Windows desktop over a pipe."""
+
+    def __init__(self, exe: str):
+        self.proc = subprocess.Popen([exe], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+
+    def _readinto(self, buf: memoryview):
+        got = 0
+        while got < len(buf):
+            n = self.proc.stdout.readinto(buf[got:])
+            if not n:
+                raise RuntimeError("screenshare_helper.exe exited")
+            got += n
+
+    def grab(self):
+        # 0,0,0,0 = whole primary screen (WSLg monitor geometry does not map to Windows coordinates)
+        self.proc.stdin.write(struct.pack("<4i", 0, 0, 0, 0))
+        hdr = bytearray(8)
+        self._readinto(memoryview(hdr))
+        w, h = struct.unpack("<2i", hdr)
+        if w <= 0 or h <= 0:
+            raise RuntimeError("screenshare_helper.exe capture failed")
+        arr = _pinned((h, w, 4))
+        self._readinto(memoryview(arr).cast("B"))
+        return arr
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+
+
+def _wsl_helper() -> Optional[_WslHelper]:
+    """Return the cached WSL capture helper, or None if the helper binary is not built."""
+    wh = _SRC.get("wsl_helper")
+    if wh is None:
+        wh = False
+        if np is not None and os.path.isfile(_WSL_HELPER):
+            try:
+                wh = _WslHelper(_WSL_HELPER)
+            except Exception as e:
+                log.info("WSL capture helper unavailable: %s", e)
+        _SRC["wsl_helper"] = wh
+    return wh or None
+
+
+def _bgrx_frame(arr, scale: float):
+    """Hand a BGRX array to the encoder as-is, or convert (and downscale) to a PIL image."""
+    k = _BOX_FACTORS.get(scale)
+    # regions narrower/shorter than k would box down to 0 px; the PIL resize below keeps >= 1 px
+    if k and box_downscale is not None and arr.shape[0] >= k and arr.shape[1] >= k:
+        arr, scale = box_downscale(arr, k), 1.0
+    if (_TJ is not None or nvimgcodec is not None) and not (0 < scale < 1.0):
+        # TurboJPEG and the GPU encoder both take BGRX arrays; the encoder converts for PIL itself
+        return arr
+    h, w = arr.shape[:2]
+    img = Image.frombuffer("RGB", (w, h), arr, "raw", "BGRX", 0, 1)
+    if 0 < scale < 1.0:
+        img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), _RESAMPLE)
+    return img
+
+
+def _load_scaled(path: str, scale: float) -> Image.Image:
+    """Open a screenshot file and apply scale, decoding as few pixels as possible."""
+    img = Image.open(path)
+    if not (0 < scale < 1.0):
+        img.load()
+        return img
+    target = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+    if img.format == "JPEG":
+        # libjpeg decodes straight to 1/2, 1/4 or 1/8 size from the DCT coefficients
+        img.draft("RGB", target)
+    elif int(1 / scale) >= 2:
+        img = img.reduce(int(1 / scale))  # box reduce first; the filtered resize then runs on far fewer pixels
+    if img.size != target:
+        img = img.resize(target, _RESAMPLE)
+    return img
 
 
 def _open_source(monitor_index: int, left: int, top: int, width: int, height: int, scale: float) -> Tuple[bool, str]:
     """Initialize mss and set target monitor/region; populate _SRC."""
-    if _SRC["sct"] is not None:
+    if _SRC["open"]:
         return True, "Screen capture already initialized"
 
     try:
-        sct = mss.mss()
+        sct = _sct()
     except Exception as e:
         return False, f"Failed to initialize mss: {e}"
 
-    monitors = sct.monitors  # index 0 is all-monitors virtual screen; 1..N are real
+    monitors = _rescan_monitors(sct)  # index 0 is all-monitors virtual screen; 1..N are real
     if monitor_index < 0 or monitor_index >= len(monitors):
-        sct.close()
         return False, f"Invalid monitor_index {monitor_index}; available 0..{len(monitors)-1}"
 
     mon = monitors[monitor_index]
@@ -91,7 +582,8 @@ def _open_source(monitor_index: int, left: int, top: int, width: int, height: in
     scale = max(0.1, min(1.0, float(scale or 1.0)))
 
     _SRC.update({
-        "sct": sct,
+        "open": True,
+        "pool": ThreadPoolExecutor(max_workers=_BURST_WORKERS, thread_name_prefix="screenshare"),
         "monitor_index": monitor_index,
         "region": region,
         "scale": scale,
@@ -102,18 +594,33 @@ def _open_source(monitor_index: int, left: int, top: int, width: int, height: in
         },
     })
 
+    if nvimgcodec is not None:
+        _gpu_encoder()  # create the CUDA context now rather than inside the first burst
+
+    # pick the capture backend once; the probe grab also warms its buffers (mss, shm segments)
+    ok, _, backend = _select_grabber()
+    if not ok:
+        log.warning("No capture backend works yet (%s); will retry on capture", backend)
+
     log.info("Screen source ready: monitor=%s region=%s scale=%.2f", monitor_index, region, scale)
     return True, "Screen source initialized"
 
 
 def _close_source():
-    sct = _SRC.get("sct")
-    if sct is not None:
-        try:
-            sct.close()
-        except Exception:
-            pass
-    _SRC.update({"sct": None, "monitor_index": 1, "region": None, "scale": 1.0, "props": {}})
+    pool = _SRC.get("pool")
+    if pool is not None:
+        pool.shutdown(wait=True)
+    _release_handles()
+    ring = _SRC.get("shm")
+    for key in ("xshm", "wlr", "wsl_helper"):
+        if _SRC.get(key):
+            _SRC[key].close()
+    _SRC.update({"open": False, "monitor_index": 1, "region": None, "scale": 1.0, "props": {},
+                 "xshm": None, "wlr": None, "wsl_helper": None, "pool": None, "last_frame": None,
+                 "ring": [], "ring_i": 0, "ring_owner": [], "ring_seq": 0,
+                 "grab_fn": None, "grab_name": None, "grab_key": None, "shm": None, "nvjpeg": None})
+    if ring is not None:
+        _shm_release(ring)
 
 def _is_wsl() -> bool:
     """Return True if running under Windows Subsystem for Linux."""
@@ -127,56 +634,34 @@ def _is_wsl() -> bool:
     except Exception:
         return False
 
-def _grab() -> Tuple[bool, Optional[Image.Image], str]:
-    from PIL import Image
-    import shutil, subprocess, tempfile
-
-    # --- KDE Wayland Spectacle Patch ---
-    is_kde_wayland = os.environ.get('XDG_SESSION_DESKTOP') == 'KDE' and os.environ.get('XDG_SESSION_TYPE') == 'wayland'
-    if is_kde_wayland:
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-                output_path = tmp_file.name
-
-            command = ["spectacle", "-b", "-n", "-o", output_path]
-            subprocess.run(command, check=True, timeout=10)
-
-            img = Image.open(output_path)
-            os.remove(output_path) # Clean up the temp file
-
-            scale = float(_SRC.get("scale") or 1.0)
-            if 0 < scale < 1.0:
-                w = max(1, int(img.width * scale))
-                h = max(1, int(img.height * scale))
-                img = img.resize((w, h), Image.LANCZOS)
-            return True, img, "ok (spectacle)"
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
-            return False, None, f"Spectacle command failed: {e}"
-    # --- End of Patch ---
-
-    sct = _SRC.get("sct")
-    region = _SRC.get("region")
-    scale = float(_SRC.get("scale") or 1.0)
-
-    if sct is None or region is None:
-        return False, None, "Screen source not initialized"
-
-    # --- Fast path: MSS (works on macOS and most X11/Wayland setups) ---
+def _grab_spectacle(scale: float):
+    """KDE Wayland: one-shot capture via spectacle."""
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+        output_path = tmp_file.name
     try:
-        raw = sct.grab(region)
-        img = Image.frombytes("RGB", raw.size, raw.rgb)
-        if 0 < scale < 1.0:
-            w = max(1, int(img.width * scale))
-            h = max(1, int(img.height * scale))
-            img = img.resize((w, h), Image.LANCZOS)
-        return True, img, "ok"
-    except Exception as e_primary:
-        err_primary = str(e_primary)
-
-    # --- WSL fallback: capture Windows desktop via PowerShell ---
-    if _is_wsl():
-        try:
-            ps_script = r"""
+        subprocess.run(["spectacle", "-b", "-n", "-o", output_path], check=True, timeout=10)
+        return _load_scaled(output_path, scale)
+    finally:
+        os.remove(output_path)  # Clean up the temp file
+
+
+def _grab_mss(region: Dict[str, int], scale: float):
+    raw = _sct().grab(region)
+    if np is not None:
+        # zero-copy view over mss's BGRA bytearray (raw.rgb would swizzle a full copy)
+        arr = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        return _bgrx_frame(arr, scale)
+    img = Image.frombuffer("RGB", raw.size, raw.raw, "raw", "BGRX", 0, 1)
+    if 0 < scale < 1.0:
+        w = max(1, int(img.width * scale))
+        h = max(1, int(img.height * scale))
+        img = img.resize((w, h), _RESAMPLE)
+    return img
+
+
+def _grab_wsl_powershell(scale: float):
+    """WSL without the helper: capture the Windows primary screen via PowerShell."""
+    ps_script = r"""
 Add-Type -AssemblyName System.Windows.Forms
 Add-Type -AssemblyName System.Drawing
 $bounds = [System.Windows.Forms.Screen]::PrimaryScreen.Bounds
@@ -184,72 +669,310 @@ $bmp = New-Object System.Drawing.Bitmap($bounds.Width, $bounds.Height)
 $g = [System.Drawing.Graphics]::FromImage($bmp)
 $g.CopyFromScreen($bounds.Location, [System.Drawing.Point]::Empty, $bounds.Size)
 $g.Dispose()
-$tmp = [System.IO.Path]::Combine([System.IO.Path]::GetTempPath(), "wsl_scrn_{0:yyyyMMdd_HHmmss_fff}.png" -f (Get-Date))
-$bmp.Save($tmp, [System.Drawing.Imaging.ImageFormat]::Png)
+$tmp = [System.IO.Path]::Combine([System.IO.Path]::GetTempPath(), "wsl_scrn_{0:yyyyMMdd_HHmmss_fff}.__EXT__" -f (Get-Date))
+if ("__EXT__" -eq "jpg") {
+    $codec = [System.Drawing.Imaging.ImageCodecInfo]::GetImageEncoders() | Where-Object { $_.MimeType -eq "image/jpeg" }
+    $ep = New-Object System.Drawing.Imaging.EncoderParameters(1)
+    $ep.Param[0] = New-Object System.Drawing.Imaging.EncoderParameter([System.Drawing.Imaging.Encoder]::Quality, [long]92)
+    $bmp.Save($tmp, $codec, $ep)
+} else {
+    $bmp.Save($tmp, [System.Drawing.Imaging.ImageFormat]::Png)
+}
 $bmp.Dispose()
 Write-Output $tmp
 """
-            out = subprocess.check_output(
-                ["powershell.exe", "-NoProfile", "-Command", ps_script],
-                stderr=subprocess.STDOUT,
-                text=True,
-                timeout=float(os.getenv("SCREENSHARE_WSL_PS_TIMEOUT", "10")),
-            ).strip()
-            wsl_path = subprocess.check_output(["wslpath", "-u", out], text=True).strip()
-            img = Image.open(wsl_path)
-            if 0 < scale < 1.0:
-                w = max(1, int(img.width * scale))
-                h = max(1, int(img.height * scale))
-                img = img.resize((w, h), Image.LANCZOS)
-            return True, img, "ok"
-        except Exception as e_ps:
-            err_ps = str(e_ps)
-    else:
-        err_ps = "n/a"
+    # JPEG only pays off when draft() can decode at <= 1/2 size; otherwise keep lossless PNG
+    ps_script = ps_script.replace("__EXT__", "jpg" if 0 < scale <= 0.5 else "png")
+    out = subprocess.check_output(
+        ["powershell.exe", "-NoProfile", "-Command", ps_script],
+        stderr=subprocess.STDOUT,
+        text=True,
+        timeout=float(os.getenv("SCREENSHARE_WSL_PS_TIMEOUT", "10")),
+    ).strip()
+    wsl_path = subprocess.check_output(["wslpath", "-u", out], text=True).strip()
+    return _load_scaled(wsl_path, scale)
+
+
+def _grab_tool(tool: str, scale: float):
+    """GNOME (gnome-screenshot) or wlroots (grim) full-output screenshot through a temp PNG."""
+    tmp_png = os.path.join(tempfile.gettempdir(), "screenshare_fallback.png")
+    subprocess.run([tool, "--file", tmp_png] if tool == "gnome-screenshot" else [tool, tmp_png],
+                   check=True, timeout=10)
+    return _load_scaled(tmp_png, scale)
+
+
+def _disable_backend(key: Optional[str]):
+    """Close a failed stateful grabber (xshm / wlr / wsl_helper) and keep it from being probed again."""
+    if key and _SRC.get(key):
+        try:
+            _SRC[key].close()
+        except Exception:
+            pass
+        _SRC[key] = False
 
-    # --- Linux compositor fallbacks: GNOME or wlroots ---
-    try:
-        tmp_png = os.path.join(tempfile.gettempdir(), "screenshare_fallback.png")
-        if shutil.which("gnome-screenshot"):
-            subprocess.run(["gnome-screenshot", "--file", tmp_png], check=True, timeout=10)
-        elif shutil.which("grim"):
-            # full-output Wayland screenshot on wlroots compositors (e.g., sway/hyprland)
-            subprocess.run(["grim", tmp_png], check=True, timeout=10)
-        else:
-            raise RuntimeError("no compositor screenshot tool (gnome-screenshot/grim) found")
 
-        img = Image.open(tmp_png)
-        if 0 < scale < 1.0:
-            w = max(1, int(img.width * scale))
-            h = max(1, int(img.height * scale))
-            img = img.resize((w, h), Image.LANCZOS)
-        return True, img, "ok"
-    except Exception as e_fb:
-        err_fallback = str(e_fb)
+def _select_grabber() -> Tuple[bool, Optional[Any], str]:
+    """
+    Probe the capture backends once, in priority order, and bind the first that works to
+    _SRC["grab_fn"] as a zero-argument closure so steady-state grabs skip all detection.
+    Returns (ok, frame from the successful probe, backend name or collected errors).
+    """
+    region = _SRC["region"]
+    scale = float(_SRC.get("scale") or 1.0)
+    candidates = []
+    if os.environ.get("XDG_SESSION_DESKTOP") == "KDE" and os.environ.get("XDG_SESSION_TYPE") == "wayland":
+        candidates.append(("spectacle", None, lambda: _grab_spectacle(scale)))
+    xs = _xshm()
+    if xs is not None:
+        candidates.append(("xshm", "xshm", lambda: _bgrx_frame(xs.grab(region), scale)))
+    candidates.append(("mss", None, lambda: _grab_mss(region, scale)))
+    if _is_wsl():
+        wh = _wsl_helper()
+        if wh is not None:
+            candidates.append(("wsl helper", "wsl_helper", lambda: _bgrx_frame(wh.grab(), scale)))
+        candidates.append(("wsl powershell", None, lambda: _grab_wsl_powershell(scale)))
+    wc = _wlr()
+    if wc is not None:
+        candidates.append(("wlr-screencopy", "wlr", lambda: _bgrx_frame(wc.grab(), scale)))
+    tool = next((t for t in ("gnome-screenshot", "grim") if shutil.which(t)), None)
+    if tool:
+        candidates.append((tool, None, lambda: _grab_tool(tool, scale)))
+
+    errors = []
+    for name, key, fn in candidates:
+        try:
+            frame = fn()
+        except Exception as e:
+            errors.append(f"{name}={e}")
+            # a half-read pipe or stale shm segment would corrupt later probes
+            _disable_backend(key)
+            continue
+        _SRC["grab_fn"], _SRC["grab_name"], _SRC["grab_key"] = fn, name, key
+        log.info("Capture backend: %s", name)
+        return True, frame, name
+    _SRC["grab_fn"] = _SRC["grab_name"] = _SRC["grab_key"] = None
+    return False, None, ", ".join(errors) or "no capture backend available"
+
+
+def _grab() -> Tuple[bool, Optional[Any], str]:
+    """Return (ok, frame, msg); frame is a PIL Image or an (h, w, 4) BGRX array."""
+    if not _SRC.get("open") or _SRC.get("region") is None:
+        return False, None, "Screen source not initialized"
+
+    fn = _SRC.get("grab_fn")
+    if fn is not None:
+        try:
+            return True, fn(), f"ok ({_SRC['grab_name']})"
+        except Exception as e:
+            log.info("%s capture failed, re-detecting backend: %s", _SRC["grab_name"], e)
+            _disable_backend(_SRC.get("grab_key"))
+
+    ok, frame, msg = _select_grabber()
+    if not ok:
+        # If everything failed, report details for debugging
+        return False, None, f"Failed to grab ({msg})"
+    return True, frame, f"ok ({msg})"
+
 
-    # If everything failed, report details for debugging
-    return False, None, f"Failed to grab (mss={err_primary}, wsl_ps={err_ps}, fallback={locals().get('err_fallback','n/a')})"
+# Reusable in-memory encode buffers (write-through output encodes into these first)
+_BIO_POOL: "queue.SimpleQueue[BytesIO]" = queue.SimpleQueue()
 
 
-def _encode_image_pil(img: Image.Image, fmt: str) -> Tuple[bool, bytes, str, int, int]:
+def _acquire_bio() -> BytesIO:
+    try:
+        return _BIO_POOL.get_nowait()
+    except queue.Empty:
+        return BytesIO()
+
+
+def _release_bio(bio: BytesIO):
+    bio.seek(0)
+    bio.truncate()
+    _BIO_POOL.put(bio)
+
+
+def _gpu_encoder():
+    """Return the cached (encoder, params, lock) for GPU JPEG, or None if CUDA is unusable."""
+    nv = _SRC.get("nvjpeg")
+    if nv is None:
+        nv = False
+        if nvimgcodec is not None:
+            try:
+                css = {"444": nvimgcodec.ChromaSubsampling.CSS_444,
+                       "422": nvimgcodec.ChromaSubsampling.CSS_422,
+                       "420": nvimgcodec.ChromaSubsampling.CSS_420}[_JPEG_SUB]
+                try:
+                    params = nvimgcodec.EncodeParams(quality=_JPEG_Q, chroma_subsampling=css)
+                except TypeError:  # newer releases renamed quality -> quality_value
+                    params = nvimgcodec.EncodeParams(quality_value=_JPEG_Q, chroma_subsampling=css)
+                nv = (nvimgcodec.Encoder(), params, threading.Lock())
+                log.info("GPU JPEG encode enabled for frames > %d px", _GPU_JPEG_MIN_PIXELS)
+            except Exception as e:
+                log.info("GPU JPEG encode unavailable: %s", e)
+        _SRC["nvjpeg"] = nv
+    return nv or None
+
+
+def _gpu_jpeg(arr) -> Optional[bytes]:
+    """JPEG-encode a BGRX array on the GPU; None (and GPU disabled for this source) on any CUDA error."""
+    nv = _gpu_encoder()
+    if nv is None:
+        return None
+    enc, params, lock = nv
+    try:
+        rgb = np.ascontiguousarray(arr[..., 2::-1])  # BGRX -> packed RGB for the upload
+        with lock:
+            return bytes(enc.encode(rgb, "jpeg", params))
+    except Exception as e:
+        log.warning("GPU JPEG encode failed, using CPU from now on: %s", e)
+        _SRC["nvjpeg"] = False
+        return None
+
+
+def _encode_image_pil(img: Any, fmt: str, out: BinaryIO) -> Tuple[bool, str, int, int]:
+    """
+    Encode a frame (PIL image or BGRX array) as JPEG, WebP or PNG straight into out.
+    Returns (ok, mime_or_error, w, h).
+    """
     fmt = (fmt or "jpg").lower()
-    ext = ".jpg" if fmt == "jpg" else ".png"
+    if not isinstance(img, Image.Image):
+        # BGRX ndarray from the mss / shared-memory grabbers
+        h, w = img.shape[:2]
+        data = None
+        try:
+            if fmt == "jpg" and w * h > _GPU_JPEG_MIN_PIXELS:
+                data = _gpu_jpeg(img)
+            if data is None and fmt == "jpg" and _TJ is not None:
+                data = _TJ.encode(img, quality=_JPEG_Q, pixel_format=TJPF_BGRX, jpeg_subsample=_TJ_SUBSAMPLE)
+        except Exception as e:
+            return False, f"encode failed: {e}", w, h
+        if data is not None:
+            out.write(data)
+            return True, "image/jpeg", w, h
+        img = Image.frombuffer("RGB", (w, h), img, "raw", "BGRX", 0, 1)
     try:
-        from io import BytesIO
-        bio = BytesIO()
+        if fmt == "jpg" and _TJ is not None:
+            data = _TJ.encode(np.asarray(img.convert("RGB")), quality=_JPEG_Q,
+                              pixel_format=TJPF_RGB, jpeg_subsample=_TJ_SUBSAMPLE)
+            out.write(data)
+            return True, "image/jpeg", img.width, img.height
         if fmt == "jpg":
             # ensure RGB; JPEG has no alpha
             if img.mode != "RGB":
                 img = img.convert("RGB")
-            img.save(bio, format="JPEG", quality=92, optimize=True)
+            # no optimize: the second Huffman pass costs more CPU than the bytes it saves
+            img.save(out, format="JPEG", quality=_JPEG_Q, subsampling=_PIL_SUBSAMPLING[_JPEG_SUB],
+                     optimize=False, progressive=False)
             mime = "image/jpeg"
+        elif fmt == "webp":
+            img.save(out, format="WEBP", quality=_WEBP_Q, method=_WEBP_METHOD)
+            mime = "image/webp"
         else:
-            img.save(bio, format="PNG", optimize=True)
+            img.save(out, format="PNG", optimize=True)
             mime = "image/png"
-        data = bio.getvalue()
-        return True, data, mime, img.width, img.height
+        return True, mime, img.width, img.height
     except Exception as e:
-        return False, b"", f"encode failed: {e}", img.width, img.height
+        return False, f"encode failed: {e}", img.width, img.height
+
+
+def _write_through(fpath: Path, data: memoryview):
+    """Write data with O_DSYNC in one writev per chunk, then drop the pages from the cache."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_DSYNC", 0) | getattr(os, "O_BINARY", 0)
+    fd = os.open(fpath, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            n = os.writev(fd, [view]) if hasattr(os, "writev") else os.write(fd, view)
+            view = view[n:]
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _encode_and_write(img: Any, fpath: Path, fmt: str) -> Tuple[bool, str, int, int]:
+    """Encode one frame and write it to fpath (capture and burst workers). Returns (ok, mime_or_error, w, h)."""
+    try:
+        if _ODIRECT:
+            bio = _acquire_bio()
+            ok, mime, w, h = _encode_image_pil(img, fmt, bio)
+            if ok:
+                with bio.getbuffer() as view:
+                    _write_through(fpath, view)
+            _release_bio(bio)
+        else:
+            with open(fpath, "wb") as f:
+                # encoder writes straight into the file: no intermediate BytesIO copy
+                ok, mime, w, h = _encode_image_pil(img, fmt, f)
+    except Exception as e:
+        return False, f"Failed to write file: {e}", 0, 0
+    if not ok:
+        fpath.unlink(missing_ok=True)  # don't leave a truncated frame behind
+    return ok, mime, w, h
+
+
+def _frame_hash(img: Any) -> int:
+    """Cheap fingerprint of a frame's pixels, used to spot unchanged screens."""
+    if isinstance(img, Image.Image):
+        if np is None:
+            return _hash64(img.tobytes())
+        img = np.asarray(img)
+    if img.nbytes >= 1 << 20:
+        # every 4th row, full width: glyphs are taller than 4px so text edits still register
+        img = img[::4]
+    return _hash64(np.ascontiguousarray(img))
+
+
+def _as_bgrx(img: Any):
+    """Frame as a contiguous (h, w, 4) BGRX array (file-based fallbacks produce PIL images)."""
+    if isinstance(img, Image.Image):
+        w, h = img.size
+        return np.frombuffer(img.convert("RGB").tobytes("raw", "BGRX"), dtype=np.uint8).reshape(h, w, 4)
+    return np.ascontiguousarray(img)
+
+
+def _shm_release(ring: Dict[str, Any]):
+    """Close and unlink a frame ring's block."""
+    ring["mem"].close()
+    try:
+        ring["mem"].unlink()
+    except FileNotFoundError:
+        # a consumer's resource_tracker (Python < 3.13) already unlinked it when that consumer exited
+        pass
+
+
+def _shm_write(img: Any) -> Dict[str, Any]:
+    """Copy a frame into the next slot of the shared-memory ring and describe where it landed."""
+    arr = _as_bgrx(img)
+    h, w = arr.shape[:2]
+    ring = _SRC.get("shm")
+    if ring is None or arr.nbytes > ring["slot_size"]:
+        if ring is not None:
+            _SRC["shm"] = None
+            _shm_release(ring)
+        # sized for the largest frame this source can produce (full region, unscaled)
+        region = _SRC["region"]
+        slot_size = max(arr.nbytes, 4 * int(region["width"]) * int(region["height"]))
+        mem = shared_memory.SharedMemory(create=True, size=_SHM_SLOTS * slot_size)
+        ring = _SRC["shm"] = {"mem": mem, "slot_size": slot_size, "seq": 0}
+        log.info("Shared-memory frame ring %s: %d slots x %d bytes", mem.name, _SHM_SLOTS, slot_size)
+    seq = ring["seq"]
+    ring["seq"] = seq + 1
+    slot = seq % _SHM_SLOTS
+    offset = slot * ring["slot_size"]
+    dst = np.ndarray(arr.shape, dtype=np.uint8, buffer=ring["mem"].buf, offset=offset)
+    np.copyto(dst, arr)
+    del dst  # release the export so the block can be closed later
+    return {
+        "shm": ring["mem"].name,
+        "slot": slot,
+        "seq": seq,
+        "offset": offset,
+        "width": int(w),
+        "height": int(h),
+        "stride": 4 * int(w),
+        "pixel_format": "BGRX",
+    }
 
 
 def _timestamp_name(prefix="screen", ext=".jpg") -> str:
@@ -258,6 +981,16 @@ def _timestamp_name(prefix="screen", ext=".jpg") -> str:
     return f"{prefix}_{ts}_{ms:03d}{ext}"
 
 
+def _burst_names(n: int, period_s: float, ext: str) -> list:
+    """File names for a whole burst, stamped with each frame's scheduled time (one clock read)."""
+    base = time.time()
+    names = []
+    for i in range(n):
+        t = base + i * period_s
+        names.append(f"scr_{time.strftime('%Y%m%d_%H%M%S', time.localtime(t))}_{int((t % 1) * 1000):03d}_{i:02d}{ext}")
+    return names
+
+
 # ---------- MCP server ----------
 mcp = FastMCP("Screen MCP")
 
@@ -266,21 +999,22 @@ mcp = FastMCP("Screen MCP")
 def list_displays(max_index: int = 10) -> Dict[str, Any]:
     """Enumerate available displays/monitors with geometry."""
     try:
-        with mss.mss() as sct:
-            mons = sct.monitors  # 0=virtual bounding box, 1..N real
-            out = []
-            for i, mon in enumerate(mons):
-                if i > max_index:
-                    break
-                out.append({
-                    "index": i,
-                    "left": int(mon.get("left", 0)),
-                    "top": int(mon.get("top", 0)),
-                    "width": int(mon.get("width", 0)),
-                    "height": int(mon.get("height", 0)),
-                    "virtual": (i == 0),
-                })
-            return {"displays": out}
+        mons = _MON_CACHE["mons"]
+        if mons is None or time.monotonic() - _MON_CACHE["t"] >= _MON_CACHE_TTL:
+            mons = _rescan_monitors(_sct())
+        out = []
+        for i, mon in enumerate(mons):
+            if i > max_index:
+                break
+            out.append({
+                "index": i,
+                "left": int(mon.get("left", 0)),
+                "top": int(mon.get("top", 0)),
+                "width": int(mon.get("width", 0)),
+                "height": int(mon.get("height", 0)),
+                "virtual": (i == 0),
+            })
+        return {"displays": out}
     except Exception as e:
         return {"displays": [], "error": str(e)}
 
@@ -300,16 +1034,17 @@ def screenshare_start(
     - left/top/width/height: optional crop region relative to the chosen monitor; if width/height <= 0, uses full monitor
     - scale: 0.1..1.0 downscale to reduce file size
     """
-    ok, msg = _open_source(monitor_index, left, top, width, height, scale)
+    with _SRC_LOCK:
+        ok, msg = _open_source(monitor_index, left, top, width, height, scale)
     return {"ok": ok, "message": msg, "props": _SRC["props"], "monitor_index": _SRC["monitor_index"]}
 
 
 @mcp.tool()
 def screenshare_status() -> Dict[str, Any]:
     """Report whether screen source is initialized and its properties."""
-    sct = _SRC.get("sct")
     return {
-        "open": bool(sct is not None),
+        "open": bool(_SRC.get("open")),
+        "backend": _SRC.get("grab_name"),
         "monitor_index": _SRC.get("monitor_index"),
         "props": _SRC.get("props", {}),
     }
@@ -324,32 +1059,28 @@ def screenshare_capture(
     Capture one screenshot. Saves to save_dir and returns the saved path and metadata.
     (No base64 returned.)
     """
-    ok, img, msg = _grab()
-    if not ok or img is None:
-        return {"ok": False, "error": msg}
-
-    ok2, data, mime, w, h = _encode_image_pil(img, format)
-    if not ok2:
-        return {"ok": False, "error": mime}
-
-    out_dir = Path(os.path.expanduser(save_dir))
-    out_dir.mkdir(parents=True, exist_ok=True)
-    ext = ".jpg" if mime == "image/jpeg" else ".png"
-    fname = _timestamp_name("screen", ext)
-    fpath = out_dir / fname
-    try:
-        with open(fpath, "wb") as f:
-            f.write(data)
-    except Exception as e:
-        return {"ok": False, "error": f"Failed to write file: {e}"}
+    with _SRC_LOCK:
+        ok, img, msg = _grab()
+        if not ok or img is None:
+            return {"ok": False, "error": msg}
 
-    return {
-        "ok": True,
-        "path": str(fpath),
-        "mime": mime,
-        "width": int(w),
-        "height": int(h),
-    }
+        out_dir = Path(os.path.expanduser(save_dir))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        ext, _ = _FORMATS.get((format or "jpg").lower(), _FORMATS["png"])
+        fname = _timestamp_name("screen", ext)
+        fpath = out_dir / fname
+        # encoded straight into the target file
+        ok2, mime, w, h = _encode_and_write(img, fpath, format)
+        if not ok2:
+            return {"ok": False, "error": mime}
+
+        return {
+            "ok": True,
+            "path": str(fpath),
+            "mime": mime,
+            "width": int(w),
+            "height": int(h),
+        }
 
 
 @mcp.tool()
@@ -360,77 +1091,176 @@ def screenshare_burst(
     format: str = "jpg",
     warmup: int = 0,
     duration_ms: int = 0,
+    output: str = "file",
 ) -> Dict[str, Any]:
     """
     Capture N screenshots spaced by period_ms and return their file paths (chronological).
+    output="shm" skips encoding/disk and returns "frames": shared-memory ring slots of raw BGRX
+    (see screenshare_capture_shm); only the last SCREENSHARE_SHM_SLOTS frames are returned, the
+    earlier ones were overwritten during the burst ("overwritten" in the result).
     If duration_ms > 0, n is computed as round(duration_ms / period_ms).
+    Frames identical to the previous one are hardlinked rather than re-encoded ("duplicates" in the result).
+    Slots missed by more than one period are skipped to keep cadence ("dropped" in the result).
     (No base64 returned.)
     """
-    if _SRC.get("sct") is None:
-        return {"ok": False, "error": "Screen source not initialized"}
-
-    # compute n from duration if provided
-    if duration_ms and duration_ms > 0:
-        n = max(1, int(round(float(duration_ms) / float(period_ms))))
-
-    out_dir = Path(os.path.expanduser(save_dir))
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    period_s = max(0.0, float(period_ms) / 1000.0)
-    t0 = time.perf_counter()
-
-    paths: list[str] = []
-    mime_last = "image/jpeg" if (format or "jpg").lower() == "jpg" else "image/png"
-    w_last = h_last = 0
-
-    # optional warmup no-op (kept for API parity)
-    for _ in range(max(0, int(warmup))):
-        _grab()
+    with _SRC_LOCK:
+        pool = _SRC.get("pool")
+        if not _SRC.get("open") or pool is None:
+            return {"ok": False, "error": "Screen source not initialized"}
+        shm_out = (output or "file").lower() == "shm"
+        if shm_out and np is None:
+            return {"ok": False, "error": "output='shm' requires numpy"}
+
+        # compute n from duration if provided
+        if duration_ms and duration_ms > 0:
+            n = max(1, int(round(float(duration_ms) / float(period_ms))))
+
+        out_dir = Path(os.path.expanduser(save_dir))
+        if not shm_out:
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+        period_s = max(0.0, float(period_ms) / 1000.0)
+        n = max(1, int(n))
+
+        paths: list[str] = []
+        fmt = (format or "jpg").lower()
+        ext, mime_last = _FORMATS.get(fmt, _FORMATS["png"])
+        w_last = h_last = 0
+
+        # optional warmup no-op (kept for API parity)
+        for _ in range(max(0, int(warmup))):
+            _grab()
+
+        names = None if shm_out else _burst_names(n, period_s, ext)
+        t0 = time.perf_counter()
+
+        # grab on this thread; encode + write of frame i overlaps the wait/grab of frame i+1
+        pending = []
+        frames: list = []
+        inflight: deque = deque()
+        grab_error = None
+        dups = dropped = 0
+        i = 0
+        while i < n:
+            # bound queued frames (memory); pinned-slot reuse itself is guarded in _pinned()
+            while len(inflight) > _RING_SLOTS - 2:
+                inflight.popleft().result()
+
+            target = t0 + i * period_s
+            now = time.perf_counter()
+            if period_s > 0 and now > target + period_s:
+                # more than a whole period late: drop the missed slots instead of cascading the delay
+                i_now = int((now - t0) / period_s)
+                dropped += min(i_now, n) - i
+                i = i_now
+                if i >= n:
+                    break
+            elif target > now:
+                time.sleep(target - now)
+
+            seq = _SRC["ring_seq"]
+            ok, img, msg = _grab()
+            if not ok or img is None:
+                grab_error = f"Failed to capture: {msg}"
+                break
+
+            if shm_out:
+                frames.append(_shm_write(img))
+                i += 1
+                continue
+
+            fpath = out_dir / names[i]
+            i += 1
+
+            # unchanged screen: hardlink the previous frame instead of encoding it again
+            key = (_frame_hash(img), fmt)
+            prev = _SRC.get("last_frame")
+            if prev is not None and prev[0] == key and prev[2].result()[0]:
+                try:
+                    os.link(prev[1], fpath)
+                    pending.append((fpath, prev[2]))
+                    dups += 1
+                    continue
+                except OSError:
+                    pass  # previous file gone or no hardlinks on this filesystem: encode normally
+
+            fut = pool.submit(_encode_and_write, img, fpath, format)
+            pending.append((fpath, fut))
+            inflight.append(fut)
+            _claim_slot(seq, fut)
+            _SRC["last_frame"] = (key, fpath, fut)
+
+        if dropped:
+            log.info("Burst fell behind period_ms=%s; dropped %d of %d slots", period_ms, dropped, n)
+
+        if shm_out:
+            # the ring wrapped (or was regrown) under older frames: only return slots still holding them
+            live = [f for f in frames[-_SHM_SLOTS:] if f["shm"] == frames[-1]["shm"]] if frames else []
+            res = {
+                "ok": grab_error is None,
+                "frames": live,
+                "n": len(live),
+                "slots": _SHM_SLOTS,
+                "overwritten": len(frames) - len(live),
+                "dropped": dropped,
+                "period_ms": period_ms,
+                "duration_ms": duration_ms,
+            }
+            if grab_error:
+                res["error"] = grab_error
+            return res
+
+        for i, (fpath, fut) in enumerate(pending):
+            ok2, mime, w, h = fut.result()
+            if not ok2:
+                for _, rest in pending[i + 1:]:
+                    rest.result()
+                return {"ok": False, "error": mime, "paths": paths}
+            mime_last, w_last, h_last = mime, w, h
+            paths.append(str(fpath))
+
+            if i == 0 or (i + 1) % 5 == 0 or (i + 1) == len(pending):
+                log.info("Burst capture %d/%d saved %s", i + 1, len(pending), fpath.name)
+
+        if grab_error:
+            return {"ok": False, "error": grab_error, "paths": paths}
+
+        return {
+            "ok": True,
+            "paths": paths,
+            "mime": mime_last,
+            "width": int(w_last),
+            "height": int(h_last),
+            "n": len(paths),
+            "duplicates": dups,
+            "dropped": dropped,
+            "period_ms": period_ms,
+            "duration_ms": duration_ms,
+            "save_dir": str(out_dir),
+        }
 
-    for i in range(max(1, int(n))):
-        target = t0 + i * period_s
-        now = time.perf_counter()
-        if target > now:
-            time.sleep(target - now)
 
+@mcp.tool()
+def screenshare_capture_shm() -> Dict[str, Any]:
+    """
+    Capture one screenshot as raw BGRX into a shared-memory ring (no encode, no file).
+    Returns the block name, slot, byte offset, width/height/stride; attach with
+    multiprocessing.shared_memory.SharedMemory(name=...) and read height*stride bytes at offset.
+    """
+    with _SRC_LOCK:
+        if np is None:
+            return {"ok": False, "error": "shared-memory capture requires numpy"}
         ok, img, msg = _grab()
         if not ok or img is None:
-            return {"ok": False, "error": f"Failed to capture: {msg}", "paths": paths}
-
-        ok2, data, mime, w, h = _encode_image_pil(img, format)
-        if not ok2:
-            return {"ok": False, "error": "encode failed", "paths": paths}
-        mime_last, w_last, h_last = mime, w, h
-
-        ts = time.strftime("%Y%m%d_%H%M%S")
-        ms = int((time.time() % 1) * 1000)
-        ext = ".jpg" if mime == "image/jpeg" else ".png"
-        fname = f"scr_{ts}_{ms:03d}_{i:02d}{ext}"
-        fpath = out_dir / fname
-        with open(fpath, "wb") as f:
-            f.write(data)
-        paths.append(str(fpath))
-
-        if i == 0 or (i + 1) % 5 == 0 or (i + 1) == n:
-            log.info("Burst capture %d/%d saved %s", i + 1, n, fpath.name)
-
-    return {
-        "ok": True,
-        "paths": paths,
-        "mime": mime_last,
-        "width": int(w_last),
-        "height": int(h_last),
-        "n": len(paths),
-        "period_ms": period_ms,
-        "duration_ms": duration_ms,
-        "save_dir": str(out_dir),
-    }
+            return {"ok": False, "error": msg}
+        return {"ok": True, **_shm_write(img)}
 
 
 @mcp.tool()
 def screenshare_stop() -> Dict[str, Any]:
     """Release the screen source."""
-    _close_source()
+    with _SRC_LOCK:
+        _close_source()
     return {"ok": True}
 
 
@@ -0,0 +1,91 @@
+/*
+ * screenshare_helper.exe - Windows-side capture helper for the WSL path of screenshare_mcp.py.
+ *
+ * Build with mingw-w64 (e.g. `sudo apt install gcc-mingw-w64-x86-64` inside WSL):
+ *   x86_64-w64-mingw32-gcc -O2 -o ../bin/screenshare_helper.exe screenshare_helper.c -lgdi32 -luser32
+ *
+ * Protocol over stdin/stdout, little-endian int32:
+ *   request : left, top, width, height      (width or height <= 0 => whole primary screen)
+ *   response: width, height, then width*height*4 bytes of top-down BGRX
+ *             (width = height = 0 if the capture failed)
+ * Requests are served until stdin closes, so the server keeps one process per screen source
+ * and pays the Windows process start-up cost once instead of per frame.
+ */
+#include <windows.h>
+#include <fcntl.h>
+#include <io.h>
+#include <stdint.h>
+#include <stdio.h>
+
+static int write_full(const void *buf, size_t n)
+{
+    return fwrite(buf, 1, n, stdout) == n;
+}
+
+int main(void)
+{
+    HDC screen, mem;
+    HBITMAP bmp = NULL;
+    void *bits = NULL;
+    int bw = 0, bh = 0;
+    int32_t req[4];
+
+    _setmode(_fileno(stdin), _O_BINARY);
+    _setmode(_fileno(stdout), _O_BINARY);
+    SetProcessDPIAware(); /* physical pixels, same as the PowerShell fallback on scaled displays */
+
+    screen = GetDC(NULL);
+    mem = CreateCompatibleDC(screen);
+    if (!screen || !mem)
+        return 1;
+
+    while (fread(req, sizeof(int32_t), 4, stdin) == 4) {
+        int x = req[0], y = req[1], w = req[2], h = req[3];
+        int32_t hdr[2] = {0, 0};
+
+        if (w <= 0 || h <= 0) {
+            x = 0;
+            y = 0;
+            w = GetSystemMetrics(SM_CXSCREEN);
+            h = GetSystemMetrics(SM_CYSCREEN);
+        }
+
+        /* the DIB section is the transfer buffer; reallocate only when the size changes */
+        if (w != bw || h != bh) {
+            BITMAPINFO bi;
+            ZeroMemory(&bi, sizeof(bi));
+            bi.bmiHeader.biSize = sizeof(BITMAPINFOHEADER);
+            bi.bmiHeader.biWidth = w;
+            bi.bmiHeader.biHeight = -h; /* top-down rows */
+            bi.bmiHeader.biPlanes = 1;
+            bi.bmiHeader.biBitCount = 32;
+            bi.bmiHeader.biCompression = BI_RGB;
+            if (bmp)
+                DeleteObject(bmp);
+            bmp = CreateDIBSection(mem, &bi, DIB_RGB_COLORS, &bits, NULL, 0);
+            bw = bh = 0;
+            if (bmp) {
+                SelectObject(mem, bmp);
+                bw = w;
+                bh = h;
+            }
+        }
+
+        if (bmp && BitBlt(mem, 0, 0, w, h, screen, x, y, SRCCOPY | CAPTUREBLT)) {
+            GdiFlush();
+            hdr[0] = w;
+            hdr[1] = h;
+        }
+        if (!write_full(hdr, sizeof(hdr)))
+            break;
+        if (hdr[0] && !write_full(bits, (size_t)w * (size_t)h * 4))
+            break;
+        fflush(stdout);
+    }
+
+    if (bmp)
+        DeleteObject(bmp);
+    DeleteDC(mem);
+    ReleaseDC(NULL, screen);
+    return 0;
+}